@@ -0,0 +1,44 @@
+# benchmarks/bench_portfolio.py
+"""Compare Portfolio and FixedPointPortfolio throughput and history memory.
+
+Run from the repo root: `python -m benchmarks.bench_portfolio`
+"""
+import time
+import tracemalloc
+from src.portfolio import Portfolio, FixedPointPortfolio
+
+
+def bench(cls, trades=50000, snapshots=20000, book=500, book_snapshots=500):
+    p = cls(cash=10**9, position_limit=10**9)
+    start = time.perf_counter()
+    for i in range(trades):
+        p.execute_trade('A', 1 if i % 2 == 0 else -1, 100.0 + i % 7 * 0.01)
+    trade_s = time.perf_counter() - start
+
+    p = cls(cash=10**9, position_limit=10**9)
+    p.execute_trade('A', 10, 100.0)
+    start = time.perf_counter()
+    for _ in range(snapshots):
+        p.mark_to_market({'A': 101.0})
+    small_s = time.perf_counter() - start
+
+    p = cls(cash=10**9, position_limit=10**9)
+    symbols = [f"S{i}" for i in range(book)]
+    for s in symbols:
+        p.execute_trade(s, 10, 100.0)
+    marks = {s: 101.0 for s in symbols}
+    tracemalloc.start()
+    start = time.perf_counter()
+    for _ in range(book_snapshots):
+        p.mark_to_market(marks)
+    large_s = time.perf_counter() - start
+    mem_mb = tracemalloc.get_traced_memory()[0] / 1e6
+    tracemalloc.stop()
+    return trade_s, small_s, large_s, mem_mb
+
+
+if __name__ == "__main__":
+    for cls in (Portfolio, FixedPointPortfolio):
+        trade_s, small_s, large_s, mem_mb = bench(cls)
+        print(f"{cls.__name__:20s} trades {trade_s:.3f}s  1-symbol snapshots {small_s:.3f}s  "
+              f"500-symbol snapshots {large_s:.3f}s  history {mem_mb:.1f} MB")
@@ -6,4 +6,6 @@ __all__ = [
     "engine",
     "runner",
     "utils",
+    "blotter",
+    "stream",
 ]
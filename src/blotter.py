@@ -0,0 +1,337 @@
+# src/blotter.py
+import numbers
+import threading
+import numpy as np
+import pandas as pd
+from src.portfolio import PositionLimitError, InsufficientPositionError
+
+# rejection reason codes (0 means the order was filled)
+FILLED = 0
+REJECT_POSITION_LIMIT = 1
+REJECT_INSUFFICIENT_POSITION = 2
+REJECT_OTHER = 3
+
+REASONS = {
+    FILLED: None,
+    REJECT_POSITION_LIMIT: "position_limit",
+    REJECT_INSUFFICIENT_POSITION: "insufficient_position",
+    REJECT_OTHER: "rejected",
+}
+
+NAT = np.iinfo(np.int64).min
+
+
+def rejection_reason(exc):
+    """Map an exception from `Portfolio.execute_trade` to a reason code."""
+    if isinstance(exc, PositionLimitError):
+        return REJECT_POSITION_LIMIT
+    if isinstance(exc, InsufficientPositionError):
+        return REJECT_INSUFFICIENT_POSITION
+    return REJECT_OTHER
+
+
+_COLUMNS = {
+    "tick": np.int64,
+    "timestamp": np.int64,  # ns since epoch, NAT when unknown
+    "symbol_id": np.int32,
+    "side": np.int8,  # +1 buy, -1 sell
+    "size": np.int64,  # signed requested/executed size
+    "price": np.float64,
+    "commission": np.float64,
+    "slippage_cost": np.float64,
+    "reason": np.int8,
+}
+
+
+def _to_timestamp(timestamp):
+    if timestamp is None:
+        return None
+    ts = pd.Timestamp(timestamp)
+    return None if ts is pd.NaT else ts
+
+
+class _GrowableArray:
+    """Append-only typed array with amortized O(1) appends."""
+    def __init__(self, dtype, capacity=64):
+        self.data = np.empty(capacity, dtype=dtype)
+        self.n = 0
+
+    def append(self, value):
+        if self.n == len(self.data):
+            grown = np.empty(len(self.data) * 2, dtype=self.data.dtype)
+            grown[:self.n] = self.data[:self.n]
+            self.data = grown
+        self.data[self.n] = value
+        self.n += 1
+
+    def view(self):
+        return self.data[:self.n]
+
+
+class TradeBlotter:
+    """Append-only record of fills and rejected orders.
+
+    Rows are stored column-wise in compact numpy arrays. Rows must be appended
+    in non-decreasing tick order, so the tick column itself is the index and
+    tick range queries are a binary search. Known timestamps must also be
+    non-decreasing; rows without one are kept out of the separate time index.
+    Each symbol keeps its own row/tick/timestamp index for O(log n) per-symbol
+    range queries. Timestamps are stored as UTC ns; the timezone of the first
+    one (or none) is kept and must match for later rows and queries.
+    """
+    def __init__(self, capacity=1024):
+        self._capacity = int(capacity)
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        with self.lock:
+            self._cols = {name: np.empty(self._capacity, dtype=dt) for name, dt in _COLUMNS.items()}
+            self._n = 0
+            self._last_tick = None
+            self._last_ts = NAT
+            self.tz = None
+            self._tz_known = False
+            self._time_rows = _GrowableArray(np.int64)  # rows with a known timestamp
+            self._time_stamps = _GrowableArray(np.int64)
+            self.symbols = []  # symbol_id -> symbol
+            self._symbol_ids = {}  # symbol -> symbol_id
+            self._by_symbol = []  # symbol_id -> (rows, ticks, time_rows, timestamps)
+
+    def _to_ns(self, timestamp):
+        # caller holds the lock
+        ts = _to_timestamp(timestamp)
+        if ts is None:
+            return NAT
+        if self._tz_known and (ts.tz is None) != (self.tz is None):
+            raise ValueError("Cannot mix timezone-aware and naive timestamps")
+        return int(ts.value)
+
+    def _to_datetimes(self, ns):
+        # NAT is numpy's NaT sentinel, so the int64 values reinterpret directly
+        out = pd.DatetimeIndex(np.asarray(ns, dtype=np.int64).view("datetime64[ns]"))
+        return out.tz_localize("UTC").tz_convert(self.tz) if self.tz is not None else out
+
+    def __len__(self):
+        return self._n
+
+    def symbol_id(self, symbol):
+        sid = self._symbol_ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self._symbol_ids[symbol] = sid
+            self.symbols.append(symbol)
+            self._by_symbol.append(tuple(_GrowableArray(np.int64) for _ in range(4)))
+        return sid
+
+    def record(self, tick, timestamp, symbol, size, price, commission=0.0, slippage_cost=0.0, reason=FILLED):
+        """Append one fill (or a rejection when `reason` is non-zero)."""
+        tick = int(tick)
+        if size == 0:
+            return None
+        with self.lock:
+            ts = self._to_ns(timestamp)
+            if self._last_tick is not None and tick < self._last_tick:
+                raise ValueError("Blotter ticks must be non-decreasing")
+            # only known timestamps are ordered; unknown ones stay out of the time index
+            if ts != NAT and ts < self._last_ts:
+                raise ValueError("Blotter timestamps must be non-decreasing")
+            if ts != NAT and not self._tz_known:
+                self.tz = pd.Timestamp(timestamp).tz
+                self._tz_known = True
+            sid = self.symbol_id(symbol)
+            if self._n == len(self._cols["tick"]):
+                for name, col in self._cols.items():
+                    grown = np.empty(len(col) * 2, dtype=col.dtype)
+                    grown[:self._n] = col[:self._n]
+                    self._cols[name] = grown
+            row = self._n
+            c = self._cols
+            c["tick"][row] = tick
+            c["timestamp"][row] = ts
+            c["symbol_id"][row] = sid
+            c["side"][row] = 1 if size > 0 else -1
+            c["size"][row] = int(size)
+            c["price"][row] = float(price)
+            c["commission"][row] = float(commission)
+            c["slippage_cost"][row] = float(slippage_cost)
+            c["reason"][row] = int(reason)
+            rows, ticks, time_rows, stamps = self._by_symbol[sid]
+            rows.append(row)
+            ticks.append(tick)
+            if ts != NAT:
+                time_rows.append(row)
+                stamps.append(ts)
+                self._time_rows.append(row)
+                self._time_stamps.append(ts)
+                self._last_ts = ts
+            self._n += 1
+            self._last_tick = tick
+            return row
+
+    def record_fill(self, tick, timestamp, fill, mid_price=None):
+        """Record a fill dict as returned by `Portfolio.execute_trade`.
+
+        Slippage cost is measured against `mid_price` when given.
+        """
+        if fill is None:
+            return None
+        slip = 0.0
+        if mid_price is not None:
+            slip = abs(fill['price'] - mid_price) * abs(fill['size'])
+        return self.record(tick, timestamp, fill['symbol'], fill['size'], fill['price'],
+                           commission=fill.get('commission', 0.0), slippage_cost=slip)
+
+    def record_rejection(self, tick, timestamp, symbol, size, price, reason=REJECT_OTHER):
+        return self.record(tick, timestamp, symbol, size, price, reason=reason)
+
+    def records(self, start=0):
+        """Rows from `start` onwards as a list of dicts (for event streaming)."""
+        with self.lock:
+            out = []
+            c = self._cols
+            for row in range(int(start), self._n):
+                ts = c["timestamp"][row]
+                if ts != NAT:
+                    ts = pd.Timestamp(int(ts), tz="UTC").tz_convert(self.tz) if self.tz is not None else pd.Timestamp(int(ts))
+                out.append({
+                    "tick": int(c["tick"][row]),
+                    "timestamp": None if ts == NAT else ts,
+                    "symbol": self.symbols[c["symbol_id"][row]],
+                    "side": "BUY" if c["side"][row] > 0 else "SELL",
+                    "size": int(c["size"][row]),
+                    "price": float(c["price"][row]),
+                    "commission": float(c["commission"][row]),
+                    "slippage_cost": float(c["slippage_cost"][row]),
+                    "reason": REASONS[int(c["reason"][row])],
+                })
+            return out
+
+    def columns(self):
+        """Return a dict of read-only column views (no copy)."""
+        with self.lock:
+            out = {}
+            for name, col in self._cols.items():
+                v = col[:self._n]
+                v.flags.writeable = False
+                out[name] = v
+            return out
+
+    def _rows(self, key, start, end, symbol):
+        # half-open [start, end) on `key` ('tick' or 'timestamp'); returns row indices
+        with self.lock:
+            if key == "timestamp":
+                start = None if start is None else self._to_ns(start)
+                end = None if end is None else self._to_ns(end)
+            if symbol is None:
+                if key == "tick":
+                    rows, col = None, self._cols["tick"][:self._n]
+                else:
+                    rows, col = self._time_rows.view(), self._time_stamps.view()
+            else:
+                sid = self._symbol_ids.get(symbol)
+                if sid is None:
+                    return np.empty(0, dtype=np.int64)
+                all_rows, ticks, time_rows, stamps = self._by_symbol[sid]
+                rows, col = (all_rows.view(), ticks.view()) if key == "tick" else (time_rows.view(), stamps.view())
+            lo = 0 if start is None else np.searchsorted(col, start, side="left")
+            hi = len(col) if end is None else np.searchsorted(col, end, side="left")
+            if rows is None:
+                return np.arange(lo, hi, dtype=np.int64)
+            return rows[lo:hi].copy()
+
+    def range(self, start_tick=None, end_tick=None, symbol=None):
+        """Rows with start_tick <= tick < end_tick as a DataFrame."""
+        start = None if start_tick is None else int(start_tick)
+        end = None if end_tick is None else int(end_tick)
+        return self.to_frame(self._rows("tick", start, end, symbol))
+
+    def between(self, start_time=None, end_time=None, symbol=None):
+        """Rows with start_time <= timestamp < end_time as a DataFrame.
+
+        Rows recorded without a timestamp are never returned.
+        """
+        return self.to_frame(self._rows("timestamp", start_time, end_time, symbol))
+
+    def to_frame(self, rows=None):
+        """Materialize the blotter (or the selected rows) as a DataFrame."""
+        with self.lock:
+            cols = {name: col[:self._n] for name, col in self._cols.items()}
+            if rows is not None:
+                cols = {name: col[rows] for name, col in cols.items()}
+            symbols = list(self.symbols)
+            timestamps = self._to_datetimes(cols["timestamp"])
+        return pd.DataFrame({
+            "tick": cols["tick"],
+            "timestamp": timestamps,
+            "symbol": pd.Categorical.from_codes(cols["symbol_id"], categories=symbols) if symbols else pd.Categorical([]),
+            "side": np.where(cols["side"] > 0, "BUY", "SELL"),
+            "size": cols["size"],
+            "price": cols["price"],
+            "commission": cols["commission"],
+            "slippage_cost": cols["slippage_cost"],
+            "reason": pd.Series(cols["reason"]).map(REASONS),
+        })
+
+    @staticmethod
+    def _aggregate(keys, size, price, commission, slip, filled, n_groups):
+        # vectorized group sums over integer group keys
+        fsize = np.where(filled, size, 0)
+        notional = np.abs(fsize) * price
+        buy = np.where(fsize > 0, fsize, 0)
+        sell = np.where(fsize < 0, -fsize, 0)
+        out = {
+            "fills": np.bincount(keys, weights=filled, minlength=n_groups).astype(np.int64),
+            "rejections": np.bincount(keys, weights=~filled, minlength=n_groups).astype(np.int64),
+            "buy_volume": np.bincount(keys, weights=buy, minlength=n_groups).astype(np.int64),
+            "sell_volume": np.bincount(keys, weights=sell, minlength=n_groups).astype(np.int64),
+            "net_size": np.bincount(keys, weights=fsize, minlength=n_groups).astype(np.int64),
+            "notional": np.bincount(keys, weights=notional, minlength=n_groups),
+            "commission": np.bincount(keys, weights=np.where(filled, commission, 0.0), minlength=n_groups),
+            "slippage_cost": np.bincount(keys, weights=np.where(filled, slip, 0.0), minlength=n_groups),
+        }
+        volume = out["buy_volume"] + out["sell_volume"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            out["vwap"] = np.where(volume > 0, out["notional"] / volume, np.nan)
+        return out
+
+    def by_symbol(self):
+        """Per-symbol totals: fill/rejection counts, volumes, notional, costs and VWAP."""
+        c = self.columns()
+        filled = c["reason"] == FILLED
+        agg = self._aggregate(c["symbol_id"], c["size"], c["price"], c["commission"],
+                              c["slippage_cost"], filled, len(self.symbols))
+        return pd.DataFrame(agg, index=pd.Index(list(self.symbols), name="symbol"))
+
+    def by_bucket(self, bucket, symbol=None):
+        """Totals per time bucket.
+
+        `bucket` is either an int (number of ticks) or a pandas frequency such as
+        "5min", in which case rows are bucketed on their timestamp (bucket edges
+        are aligned in UTC). Other numbers are rejected rather than read as ns.
+        """
+        c = self.columns()
+        if symbol is not None:
+            sid = self._symbol_ids.get(symbol, -1)
+            c = {name: col[c["symbol_id"] == sid] for name, col in c.items()}
+        if isinstance(bucket, numbers.Number) and not isinstance(bucket, numbers.Integral):
+            raise ValueError("bucket must be an int number of ticks or a frequency string/Timedelta")
+        if isinstance(bucket, numbers.Integral):
+            if bucket <= 0:
+                raise ValueError("bucket must be positive")
+            raw = c["tick"] // int(bucket)
+            index_name = "tick"
+            to_label = lambda k: k * int(bucket)
+        else:
+            step = pd.Timedelta(bucket).value
+            known = c["timestamp"] != NAT
+            c = {name: col[known] for name, col in c.items()}
+            raw = c["timestamp"] // step
+            index_name = "timestamp"
+            to_label = lambda k: self._to_datetimes(k * step)
+        # rows are sorted, so bucket keys are too
+        labels, keys = np.unique(raw, return_inverse=True)
+        filled = c["reason"] == FILLED
+        agg = self._aggregate(keys.ravel(), c["size"], c["price"], c["commission"],
+                              c["slippage_cost"], filled, len(labels))
+        return pd.DataFrame(agg, index=pd.Index(to_label(labels), name=index_name))
@@ -14,4 +14,150 @@ def generate_prices(symbol="SYM", n=1000, start_price=100.0, mu=0.0, sigma=0.01,
     # Use 'min' for minute frequency (FutureWarning: 'T' deprecated)
     times = pd.date_range("2025-01-01", periods=n, freq="min")  # 1-minute ticks
     df = pd.DataFrame({"timestamp": times, "symbol": symbol, "price": prices})
-    return df
\ No newline at end of file
+    return df
+
+def _factor_structure(n_symbols, rho=0.0, corr=None, loadings=None):
+    """Return (loadings (N, K), idiosyncratic scale (N,)) so that
+    z = f @ loadings.T + idio * e has unit variance and the requested correlation."""
+    if loadings is not None:
+        B = np.asarray(loadings, dtype=np.float64)
+        if B.ndim == 1:
+            # one loading per symbol on a single factor
+            B = B.reshape(-1, 1)
+        if B.shape[0] != n_symbols:
+            raise ValueError("loadings must have one row per symbol")
+        resid = 1.0 - (B ** 2).sum(axis=1)
+        if np.any(resid < 0):
+            raise ValueError("factor loadings explain more than unit variance")
+        return B, np.sqrt(resid)
+    if corr is not None:
+        C = np.asarray(corr, dtype=np.float64)
+        if C.shape != (n_symbols, n_symbols):
+            raise ValueError("corr must be an N x N matrix")
+        # a full correlation matrix is an N-factor model with no residual
+        try:
+            return np.linalg.cholesky(C), np.zeros(n_symbols)
+        except np.linalg.LinAlgError:
+            raise ValueError("corr must be positive-definite") from None
+    if not 0.0 <= rho < 1.0:
+        raise ValueError("rho must be in [0, 1)")
+    # equicorrelation via one market factor: O(N) per tick instead of O(N^2)
+    return np.full((n_symbols, 1), np.sqrt(rho)), np.full(n_symbols, np.sqrt(1.0 - rho))
+
+
+def _regime_path(rng, rows, state, remaining, transition):
+    """Fill `rows` regime labels from a Markov chain using geometric run lengths."""
+    out = np.empty(rows, dtype=np.int64)
+    pos = 0
+    while pos < rows:
+        if remaining == 0:
+            leave = transition[state].copy()
+            leave[state] = 0.0
+            state = int(rng.choice(len(leave), p=leave / leave.sum()))
+            remaining = None
+        if remaining is None:
+            stay = transition[state, state]
+            remaining = np.iinfo(np.int64).max if stay >= 1.0 else int(rng.geometric(1.0 - stay))
+        take = min(remaining, rows - pos)
+        out[pos:pos + take] = state
+        pos += take
+        remaining -= take
+    return out, state, remaining
+
+
+def iter_universe(n_symbols, n=1000, start_price=100.0, mu=0.0, sigma=0.01, rho=0.0, corr=None, loadings=None,
+                  garch=None, regimes=None, jump_prob=0.001, jump_scale=0.05, seed=42, chunk_size=None, dtype=np.float64):
+    """Yield (start_row, prices) chunks of a correlated multi-asset price model.
+
+    Log returns are r[t, i] = mu_i + m[s_t] + v[s_t] * eps[t, i] (+ jumps), where
+    eps has correlation given by `loadings` (N x K factor model), `corr` (N x N)
+    or a single market factor with pairwise correlation `rho`.
+
+    - `garch=(alpha, beta)` gives each symbol GARCH(1,1) variance with long-run
+      level sigma**2: h[t] = sigma**2 * (1 - alpha - beta) + alpha * eps[t-1]**2 + beta * h[t-1]
+    - `regimes=dict(transition=P, mu=m, vol=v)` adds a Markov regime s_t shared
+      by all symbols, with per-regime drift offsets `m` and volatility scales `v`.
+
+    Only one chunk of `chunk_size` ticks (default: about 4M values) is held at a
+    time. Each random component draws from its own stream, so the output for a
+    given seed does not depend on chunk_size.
+    """
+    # one stream per component; each is consumed in tick order across chunks
+    rng_factor, rng_idio, rng_regime, rng_jump, rng_jump_size = (
+        np.random.default_rng(s) for s in np.random.SeedSequence(seed).spawn(5))
+    N = int(n_symbols)
+    B, idio = _factor_structure(N, rho=rho, corr=corr, loadings=loadings)
+    mu = np.broadcast_to(np.asarray(mu, dtype=np.float64), (N,))
+    sigma = np.broadcast_to(np.asarray(sigma, dtype=np.float64), (N,))
+    logp = np.log(np.broadcast_to(np.asarray(start_price, dtype=np.float64), (N,))).copy()
+    if garch is not None:
+        alpha, beta = garch
+        if alpha < 0 or beta < 0 or alpha + beta >= 1:
+            raise ValueError("garch needs alpha, beta >= 0 and alpha + beta < 1")
+        omega = sigma ** 2 * (1.0 - alpha - beta)
+        h = sigma ** 2
+        eps_prev = np.zeros(N)
+    if regimes is not None:
+        P = np.asarray(regimes["transition"], dtype=np.float64)
+        if P.ndim != 2 or P.shape[0] != P.shape[1] or P.size == 0:
+            raise ValueError("regime transition must be a square matrix")
+        if np.any(P < 0) or not np.allclose(P.sum(axis=1), 1.0):
+            raise ValueError("regime transition rows must be probabilities summing to 1")
+        reg_mu = np.asarray(regimes.get("mu", np.zeros(len(P))), dtype=np.float64)
+        reg_vol = np.asarray(regimes.get("vol", np.ones(len(P))), dtype=np.float64)
+        if reg_mu.shape != (len(P),) or reg_vol.shape != (len(P),):
+            raise ValueError("regime mu and vol need one value per regime")
+        state, remaining = 0, None
+    if chunk_size is None:
+        chunk_size = max(1, (1 << 22) // N)
+
+    for start in range(0, n, chunk_size):
+        rows = min(chunk_size, n - start)
+        z = rng_factor.standard_normal((rows, B.shape[1])) @ B.T
+        if np.any(idio):
+            z += idio * rng_idio.standard_normal((rows, N))
+        if garch is not None:
+            # the variance recursion is sequential in time, vectorized across symbols
+            for t in range(rows):
+                h = omega + alpha * eps_prev ** 2 + beta * h
+                eps_prev = np.sqrt(h) * z[t]
+                z[t] = eps_prev
+            ret = z
+        else:
+            ret = z * sigma
+        if regimes is not None:
+            labels, state, remaining = _regime_path(rng_regime, rows, state, remaining, P)
+            # the regime scales the shock only, not the drift
+            ret *= reg_vol[labels, None]
+            ret += reg_mu[labels, None]
+        ret += mu
+        if jump_prob > 0:
+            jumps = rng_jump.random((rows, N)) < jump_prob
+            ret[jumps] += rng_jump_size.normal(0.0, jump_scale, size=int(jumps.sum()))
+        if start == 0:
+            # the first tick is the start price
+            ret[0] = 0.0
+        np.cumsum(ret, axis=0, out=ret)
+        ret += logp
+        logp = ret[-1].copy()
+        yield start, np.exp(ret, out=ret).astype(dtype, copy=False)
+
+
+def generate_universe(symbols, n=1000, out=None, **kwargs):
+    """Generate correlated prices for `symbols` (a list, or a count).
+
+    Returns a dict symbol -> DataFrame(timestamp, symbol, price), the same
+    shape `generate_prices` produces per symbol. Pass `out` (an (n, N) array,
+    e.g. `np.memmap`) to fill a preallocated matrix chunk by chunk and get
+    `(timestamps, out)` back instead, keeping memory bounded for large runs.
+    See `iter_universe` for the model parameters.
+    """
+    if isinstance(symbols, int):
+        symbols = [f"SYM{i}" for i in range(symbols)]
+    times = pd.date_range("2025-01-01", periods=n, freq="min")  # 1-minute ticks
+    prices = np.empty((n, len(symbols)), dtype=kwargs.get("dtype", np.float64)) if out is None else out
+    for start, chunk in iter_universe(len(symbols), n=n, **kwargs):
+        prices[start:start + len(chunk)] = chunk
+    if out is not None:
+        return times, out
+    return {s: pd.DataFrame({"timestamp": times, "symbol": s, "price": prices[:, i]}) for i, s in enumerate(symbols)}
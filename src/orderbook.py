@@ -1,13 +1,23 @@
+import math
 import threading
+from decimal import Decimal
 
 class SimpleOrderBook:
     """A minimal orderbook simulator. It doesn't match limit orders — it simulates
     market impact and available liquidity. For market orders it returns an execution
     price adjusted by impact = size / depth * spread.
+
+    With `tick_size` set, prices are snapped to the tick grid and impact is
+    rounded up to whole ticks against the initiator.
     """
-    def __init__(self, depth=1000, spread=0.001):
+    def __init__(self, depth=1000, spread=0.001, tick_size=None):
         self.depth = float(depth)
         self.spread = float(spread)  # relative
+        self.tick_size = float(tick_size) if tick_size else None
+        self._tick = Decimal(str(tick_size)) if tick_size else None
+        # ticks per unit price, so prices come out as one correctly rounded division
+        per_unit = 1 / self._tick if tick_size else None
+        self._tick_div = int(per_unit) if per_unit is not None and per_unit == per_unit.to_integral_value() else None
         self.lock = threading.Lock()
 
     def execute_market_order(self, symbol, size, mid_price):
@@ -16,6 +26,13 @@ class SimpleOrderBook:
         """
         with self.lock:
             impact = (abs(size) / (self.depth + 1e-9)) * self.spread
+            if self.tick_size:
+                mid_ticks = int(round(mid_price / self.tick_size))
+                impact_ticks = math.ceil(mid_ticks * impact)
+                exec_ticks = mid_ticks + impact_ticks if size > 0 else mid_ticks - impact_ticks
+                if self._tick_div is not None:
+                    return exec_ticks / self._tick_div, size
+                return float(exec_ticks * self._tick), size
             if size > 0:
                 exec_price = mid_price * (1 + impact)
             else:
@@ -1,6 +1,18 @@
 # src/portfolio.py
+from decimal import Decimal
+from itertools import repeat
+import numpy as np
 import pandas as pd
 
+
+class PositionLimitError(ValueError):
+    """Raised when a trade would push a position past the limit."""
+
+
+class InsufficientPositionError(ValueError):
+    """Raised when selling more than the held position."""
+
+
 class Portfolio:
     def __init__(self, cash=100000.0, position_limit=100000, commission=0.0, slippage=0.0):
         self.cash = float(cash)
@@ -30,7 +42,7 @@ class Portfolio:
         current = self.positions.get(symbol, {'size': 0})['size']
         proposed = current + size
         if abs(proposed) > self.position_limit:
-            raise ValueError(f"Position limit exceeded for {symbol}")
+            raise PositionLimitError(f"Position limit exceeded for {symbol}")
 
         notional = exec_price * size
         # commission is charged per-trade (absolute)
@@ -58,7 +70,7 @@ class Portfolio:
     def _sell(self, symbol, size, price):
         pos = self.positions.get(symbol)
         if not pos or pos['size'] < size:
-            raise ValueError("Not enough position to sell")
+            raise InsufficientPositionError("Not enough position to sell")
         pnl = (price - pos['avg_price']) * size
         pos['size'] -= size
         if pos['size'] == 0:
@@ -87,14 +99,216 @@ class Portfolio:
         self.history.append(snapshot)
         return snapshot
 
+    def _history_records(self):
+        return self.history
+
     def persist_history(self, path="data/portfolio_history.csv"):
         """Write current history to CSV (appends if file exists)."""
         import os
         import pandas as pd
         if not self.history:
             return
-        df = pd.DataFrame(self.history)
+        df = pd.DataFrame(self._history_records())
         # flatten positions to JSON string
         df['positions'] = df['positions'].apply(lambda x: str(x))
         header = not os.path.exists(path)
-        df.to_csv(path, mode='a', index=False, header=header)
\ No newline at end of file
+        df.to_csv(path, mode='a', index=False, header=header)
+
+
+class FixedPointPortfolio(Portfolio):
+    """Portfolio with exact integer accounting.
+
+    Prices are held in integer ticks of `tick_size` and cash/PnL in integer
+    minor units of `cash_unit`, so repeated fills never accumulate rounding
+    drift and results are bit-reproducible. `cash` and `commission` must be
+    exact multiples of `cash_unit`, and `tick_size` a multiple of it.
+    Per-symbol sizes and cost bases live in int64 arrays indexed by symbol id,
+    and snapshots keep copies of those arrays plus the id -> symbol tuple
+    instead of a positions dict (see `snapshot_positions`). Floats are only
+    produced at the edges.
+    """
+    # below this many symbols, plain int arithmetic beats numpy call overhead
+    SMALL_BOOK = 16
+
+    def __init__(self, cash=100000.0, position_limit=100000, commission=0.0, slippage=0.0, tick_size=0.01, cash_unit=0.01):
+        self.history = []
+        self.position_limit = int(position_limit)
+        self.slippage = float(slippage)
+        tick = Decimal(str(tick_size))
+        unit = Decimal(str(cash_unit))
+        if tick <= 0 or unit <= 0:
+            raise ValueError("tick_size and cash_unit must be positive")
+        per_tick = tick / unit
+        if per_tick != per_tick.to_integral_value():
+            raise ValueError("tick_size must be a whole multiple of cash_unit")
+        self.tick_size = float(tick)
+        self.cash_unit = float(unit)
+        self.minor_per_tick = int(per_tick)
+        self._unit = unit
+        self._tick = tick
+        # for units like 0.01, minor / 100 is a single correctly rounded division
+        self._minor_div = self._per_unit(unit)
+        self._tick_div = self._per_unit(tick)
+        self.cash_minor = self._to_minor(cash)
+        self.commission_minor = self._to_minor(commission)
+        self.commission = self._to_float(self.commission_minor)
+        self.realized_pnl_minor = 0
+        self.symbols = []  # symbol_id -> symbol
+        self._symbol_ids = {}
+        self._symbols_view = ()  # shared by snapshots until a symbol is added
+        self._size = np.zeros(16, dtype=np.int64)
+        self._cost = np.zeros(16, dtype=np.int64)  # sum of fill ticks * size still held
+
+    @staticmethod
+    def _per_unit(unit):
+        per_unit = 1 / unit
+        return int(per_unit) if per_unit == per_unit.to_integral_value() else None
+
+    def _to_minor(self, amount):
+        minor = Decimal(str(amount)) / self._unit
+        if minor != minor.to_integral_value():
+            raise ValueError(f"{amount} is not a whole multiple of cash_unit {self.cash_unit}")
+        return int(minor)
+
+    def _to_float(self, minor):
+        if self._minor_div is not None:
+            return minor / self._minor_div
+        return float(minor * self._unit)
+
+    def to_price(self, ticks, size=1):
+        """Float price of `ticks / size` ticks, correctly rounded (no 0.35000000000000003)."""
+        if self._tick_div is not None:
+            return ticks / (size * self._tick_div)
+        return float(ticks * self._tick / size)
+
+    def to_ticks(self, price):
+        """Round a float price to the nearest tick (half-even)."""
+        return int(round(price / self.tick_size))
+
+    # float views of the exact state, for compatibility with Portfolio
+    @property
+    def cash(self):
+        return self._to_float(self.cash_minor)
+
+    @property
+    def realized_pnl(self):
+        return self._to_float(self.realized_pnl_minor)
+
+    @property
+    def positions(self):
+        return self._positions(self._size[:len(self.symbols)], self._cost[:len(self.symbols)])
+
+    def _positions(self, sizes, costs):
+        return self._decode(self.symbols, sizes, costs)
+
+    def _decode(self, symbols, sizes, costs):
+        held = np.flatnonzero(sizes)
+        return {
+            symbols[i]: {'size': sz, 'avg_price': self.to_price(cost, sz)}
+            for i, sz, cost in zip(held.tolist(), sizes[held].tolist(), costs[held].tolist())
+        }
+
+    def snapshot_positions(self, snapshot):
+        """Decode a snapshot's size/cost arrays into a Portfolio-style positions dict."""
+        return self._decode(snapshot['symbols'], snapshot['sizes'], snapshot['costs'])
+
+    def _symbol_id(self, symbol):
+        sid = self._symbol_ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            if sid == len(self._size):
+                self._size = np.concatenate([self._size, np.zeros_like(self._size)])
+                self._cost = np.concatenate([self._cost, np.zeros_like(self._cost)])
+            self._symbol_ids[symbol] = sid
+            self.symbols.append(symbol)
+            self._symbols_view = tuple(self.symbols)
+        return sid
+
+    def execute_trade(self, symbol, size, price):
+        """Same contract as `Portfolio.execute_trade`, settled in integer units."""
+        if size == 0:
+            return None
+        size = int(size)
+
+        # apply slippage, then snap the fill to the tick grid
+        if size > 0:
+            exec_ticks = self.to_ticks(price * (1 + abs(self.slippage)))
+        else:
+            exec_ticks = self.to_ticks(price * (1 - abs(self.slippage)))
+
+        # risk checks first, so a rejected order leaves no trace
+        sid = self._symbol_ids.get(symbol)
+        current = 0 if sid is None else self._size.item(sid)
+        if abs(current + size) > self.position_limit:
+            raise PositionLimitError(f"Position limit exceeded for {symbol}")
+        if size < 0 and current < -size:
+            raise InsufficientPositionError("Not enough position to sell")
+
+        self.cash_minor -= exec_ticks * size * self.minor_per_tick + self.commission_minor
+        if size > 0:
+            self._buy(symbol, size, exec_ticks)
+            side = 'BUY'
+        else:
+            self._sell(symbol, -size, exec_ticks)
+            side = 'SELL'
+
+        return {'symbol': symbol, 'size': size, 'price': self.to_price(exec_ticks), 'price_ticks': exec_ticks,
+                'commission': self.commission, 'side': side}
+
+    def _buy(self, symbol, size, price_ticks):
+        sid = self._symbol_id(symbol)
+        # Python ints here; storing back into int64 raises on overflow
+        self._cost[sid] = self._cost.item(sid) + price_ticks * size
+        self._size[sid] = self._size.item(sid) + size
+
+    def _sell(self, symbol, size, price_ticks):
+        sid = self._symbol_ids.get(symbol)
+        held = 0 if sid is None else self._size.item(sid)
+        if held < size:
+            raise InsufficientPositionError("Not enough position to sell")
+        cost = self._cost.item(sid)
+        # release cost pro rata; the floor remainder stays with the open lot
+        # so a full round trip realizes exactly fill proceeds - fill costs
+        released = cost * size // held
+        self.realized_pnl_minor += (price_ticks * size - released) * self.minor_per_tick
+        self._cost[sid] = cost - released
+        self._size[sid] = held - size
+
+    def mark_to_market(self, market_prices: dict, timestamp=None):
+        """Snapshot with PnL and exposure summed exactly in integer units."""
+        n = len(self.symbols)
+        sizes = self._size[:n].copy()
+        costs = self._cost[:n].copy()
+        if n <= self.SMALL_BOOK:
+            value = basis = 0
+            for sid, sz, cost in zip(range(n), sizes.tolist(), costs.tolist()):
+                mprice = market_prices.get(self.symbols[sid]) if sz else None
+                if mprice is None:
+                    continue
+                v = self.to_ticks(mprice) * sz
+                value += v
+                basis += cost
+        else:
+            marks = np.fromiter(map(market_prices.get, self.symbols, repeat(np.nan)), dtype=np.float64, count=n)
+            known = (sizes != 0) & ~np.isnan(marks)
+            v = np.rint(marks[known] / self.tick_size).astype(np.int64) * sizes[known]
+            value = int(v.sum())
+            basis = int(costs[known].sum())
+        snapshot = {
+            "timestamp": timestamp,
+            "cash": self.cash,
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self._to_float((value - basis) * self.minor_per_tick),
+            "total_exposure": self._to_float(value * self.minor_per_tick),
+            "symbols": self._symbols_view,  # symbol id -> symbol
+            "sizes": sizes,  # int64, indexed by symbol id
+            "costs": costs,
+        }
+        self.history.append(snapshot)
+        return snapshot
+
+    def _history_records(self):
+        return [
+            {k: v for k, v in dict(s, positions=self.snapshot_positions(s)).items() if k not in ('symbols', 'sizes', 'costs')}
+            for s in self.history
+        ]
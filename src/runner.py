@@ -2,20 +2,24 @@
 from .generator import generate_prices
 from .engine import SimpleMAStrategy
 from .portfolio import Portfolio
+from .blotter import TradeBlotter
 
 df = generate_prices(n=1000)
 strat = SimpleMAStrategy(short_window=5, long_window=20, order_size=10)
 port = Portfolio(cash=100000)
+blotter = TradeBlotter()
 
-for _, row in df.iterrows():
+for tick, row in df.iterrows():
     signal = strat.on_price(row['price'])
+    fill = None
     if signal == "BUY":
-        port.execute_trade(row['symbol'], size=strat.order_size, price=row['price'])
+        fill = port.execute_trade(row['symbol'], size=strat.order_size, price=row['price'])
     elif signal == "SELL":
         # naive: close full position if exists
         pos = port.positions.get(row['symbol'])
         if pos:
-            port.execute_trade(row['symbol'], size=-pos['size'], price=row['price'])
+            fill = port.execute_trade(row['symbol'], size=-pos['size'], price=row['price'])
+    blotter.record_fill(tick, row['timestamp'], fill, mid_price=row['price'])
     port.mark_to_market({row['symbol']: row['price']}, timestamp=row['timestamp'])
 
 # Save history to CSV
@@ -29,3 +33,4 @@ print(f"Final Cash: {final['cash']}")
 print(f"Realized P&L: {final['realized_pnl']}")
 print(f"Unrealized P&L: {final['unrealized_pnl']}")
 print(f"Total Exposure: {final['total_exposure']}")
+print(blotter.by_symbol())
@@ -1,8 +1,12 @@
+import logging
 import threading
 import time
 from typing import Dict, List
 import pandas as pd
 from src.orderbook import SimpleOrderBook
+from src.blotter import TradeBlotter, rejection_reason
+
+logger = logging.getLogger(__name__)
 
 
 class SimulationBackend:
@@ -17,6 +21,8 @@ class SimulationBackend:
         self.idx = 0
         self.tick_interval = 0.01
         self.history = []
+        self.blotter = TradeBlotter()
+        self.listeners = []  # callables (event_type, data), e.g. StreamServer.publish
 
     def configure(self, prices: Dict[str, pd.DataFrame], engines: Dict[str, object], portfolio, tick_interval=0.01):
         with self.lock:
@@ -26,6 +32,7 @@ class SimulationBackend:
             self.tick_interval = float(tick_interval)
             self.idx = 0
             self.history = []
+            self.blotter.clear()
             self._stop_event.clear()
 
     def start(self):
@@ -40,10 +47,38 @@ class SimulationBackend:
         if self.thread:
             self.thread.join(timeout=1.0)
 
+    def add_listener(self, listener):
+        """Register a callable invoked as listener(event_type, data) for each
+        'tick', 'fill' and 'snapshot' event. Listeners run on the simulation
+        thread outside the lock and must not block."""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _emit(self, events):
+        for listener in list(self.listeners):
+            for event_type, data in events:
+                try:
+                    listener(event_type, data)
+                except Exception:
+                    # a broken listener must not stop the simulation
+                    pass
+
+    def _record(self, method, *args, **kwargs):
+        # blotter bookkeeping must not stop the simulation
+        try:
+            method(*args, **kwargs)
+        except ValueError as e:
+            logger.warning("Trade blotter skipped a row at tick %s: %s", self.idx, e)
+
     def reset(self):
         with self.lock:
             self.idx = 0
             self.history = []
+            self.blotter.clear()
             if self.portfolio:
                 self.portfolio.history = []
 
@@ -58,16 +93,21 @@ class SimulationBackend:
                 # get market prices at current idx
                 market_prices = {}
                 timestamp = None
+                exhausted = False
                 for s in symbols:
                     df = self.prices[s]
                     if self.idx >= len(df):
                         # end simulation when any series ends
                         self._stop_event.set()
+                        exhausted = True
                         break
                     row = df.iloc[self.idx]
                     market_prices[s] = float(row['price'])
                     timestamp = row['timestamp'] if timestamp is None else timestamp
+                if exhausted:
+                    break
 
+                first_fill = len(self.blotter)
                 # strategy decisions and trades
                 for s, engine in self.engines.items():
                     price = market_prices.get(s)
@@ -83,15 +123,27 @@ class SimulationBackend:
                     if size != 0:
                         exec_price, executed_size = self.orderbook.execute_market_order(s, size, price)
                         try:
-                            self.portfolio.execute_trade(s, executed_size, exec_price)
+                            fill = self.portfolio.execute_trade(s, executed_size, exec_price)
                         except Exception as e:
-                            # ignore or log insufficient position
-                            pass
+                            self._record(self.blotter.record_rejection, self.idx, timestamp, s, executed_size, exec_price, rejection_reason(e))
+                        else:
+                            # only reached once the portfolio has accepted the trade
+                            self._record(self.blotter.record_fill, self.idx, timestamp, fill, mid_price=price)
                 # mark to market and record snapshot
                 snapshot = self.portfolio.mark_to_market(market_prices, timestamp=timestamp)
                 snapshot['tick'] = self.idx
                 self.history.append(snapshot)
+                events = []
+                if self.listeners:
+                    events.append(('tick', {'tick': self.idx, 'timestamp': timestamp, 'prices': market_prices}))
+                    events.extend(('fill', f) for f in self.blotter.records(first_fill))
+                    if hasattr(self.portfolio, 'snapshot_positions'):
+                        # subscribers get the Portfolio schema, not symbol-id arrays
+                        snapshot = dict(snapshot, positions=self.portfolio.snapshot_positions(snapshot))
+                    events.append(('snapshot', snapshot))
                 self.idx += 1
+            if events:
+                self._emit(events)
             # sleep outside lock
             time.sleep(self.tick_interval)
 
@@ -101,6 +153,7 @@ class SimulationBackend:
                 'idx': self.idx,
                 'history': list(self.history),
                 'portfolio': self.portfolio,
+                'blotter': self.blotter,
             }
 
 
@@ -128,6 +181,34 @@ def get_state():
     return _backend.get_state()
 
 
+_stream = None
+
+
+def start_stream(host="127.0.0.1", port=8765):
+    """Serve backend events to local subscribers (see src.stream)."""
+    global _stream
+    from src.stream import StreamServer
+    if _stream is None:
+        server = StreamServer(host=host, port=port)
+        # raises (e.g. port in use) before anything is registered
+        server.start()
+        _backend.add_listener(server.publish)
+        _stream = server
+    return _stream
+
+
+def stop_stream():
+    global _stream
+    if _stream is not None:
+        _backend.remove_listener(_stream.publish)
+        _stream.stop()
+        _stream = None
+
+
+def get_fills():
+    return _backend.blotter.to_frame()
+
+
 def persist(path="data/portfolio_history.csv"):
     if _backend.portfolio:
         _backend.portfolio.persist_history(path)
@@ -0,0 +1,282 @@
+# src/stream.py
+"""Local publish/subscribe streaming of simulation events.
+
+Events are sent as line-delimited JSON (one object per line):
+
+    {"type": "tick", "seq": 12, "data": {...}}
+
+A subscriber connects over TCP, sends one JSON line naming the topics it wants
+(`{"topics": ["tick", "fill"]}`, or `{}` for everything) and then only reads.
+The server answers with a `subscribed` event once the subscriber is registered;
+events published before that are not delivered to it.
+Slow subscribers never block the publisher: tick and snapshot events are
+conflated to the latest pending value, and fill events are dropped oldest-first
+once a subscriber's queue is full.
+"""
+import asyncio
+import json
+import socket
+import threading
+from collections import deque
+import numpy as np
+
+TOPICS = ("tick", "fill", "snapshot")
+# topics where only the latest pending event matters
+CONFLATED = {"tick", "snapshot"}
+
+
+def _default(obj):
+    # numpy values (e.g. FixedPointPortfolio snapshot arrays), then timestamps etc.
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    return str(obj)
+
+
+def encode(topic, seq, data):
+    return (json.dumps({"type": topic, "seq": seq, "data": data}, default=_default, separators=(",", ":")) + "\n").encode()
+
+
+class _Subscriber:
+    def __init__(self, writer, topics, max_pending):
+        self.writer = writer
+        self.topics = set(topics) if topics else None
+        self.max_pending = int(max_pending)
+        self.latest = {}  # conflated topic -> encoded line
+        self.queue = deque()  # non-conflated encoded lines
+        self.dropped = 0
+        self.wakeup = asyncio.Event()
+
+    def offer(self, topic, line):
+        if self.topics is not None and topic not in self.topics:
+            return
+        if topic in CONFLATED:
+            if topic in self.latest:
+                self.dropped += 1
+            self.latest[topic] = line
+        else:
+            if len(self.queue) >= self.max_pending:
+                self.queue.popleft()
+                self.dropped += 1
+            self.queue.append(line)
+        self.wakeup.set()
+
+    def take(self):
+        lines = list(self.queue)
+        self.queue.clear()
+        # conflated state goes last so it reflects everything before it
+        lines.extend(self.latest.pop(t) for t in TOPICS if t in self.latest)
+        return b"".join(lines)
+
+
+class StreamServer:
+    """asyncio TCP server on its own daemon thread.
+
+    `publish()` is thread-safe and non-blocking, so it can be called from the
+    simulation thread (see `SimulationBackend.add_listener`).
+    """
+    def __init__(self, host="127.0.0.1", port=8765, max_pending=256, write_buffer=64 * 1024):
+        self.host = host
+        self.port = int(port)
+        self.max_pending = int(max_pending)
+        self.write_buffer = int(write_buffer)
+        self.subscribers = set()
+        self.seq = 0
+        self.loop = None
+        self.thread = None
+        self._server = None
+        self._started = threading.Event()
+        self._error = None
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self._started.clear()
+        self._error = None
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+        self._started.wait(timeout=5.0)
+        if self._error is not None:
+            raise self._error
+
+    def stop(self):
+        if self.loop is None:
+            return
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        if self.thread:
+            self.thread.join(timeout=1.0)
+        self.loop = None
+
+    def _run(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            self._server = loop.run_until_complete(asyncio.start_server(self._handle, self.host, self.port))
+        except OSError as e:
+            self._error = e
+            self._started.set()
+            loop.close()
+            return
+        # resolve port=0 to the one actually bound
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.loop = loop
+        self._started.set()
+        try:
+            loop.run_forever()
+        finally:
+            self._server.close()
+            tasks = asyncio.all_tasks(loop)
+            for task in tasks:
+                task.cancel()
+            loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+            loop.close()
+
+    def publish(self, topic, data):
+        """Encode an event once and fan it out to all subscribers."""
+        loop = self.loop
+        if loop is None or not self.subscribers:
+            return
+        self.seq += 1
+        line = encode(topic, self.seq, data)
+        try:
+            loop.call_soon_threadsafe(self._fanout, topic, line)
+        except RuntimeError:
+            # loop closed while publishing
+            pass
+
+    def _fanout(self, topic, line):
+        for sub in self.subscribers:
+            sub.offer(topic, line)
+
+    async def _handle(self, reader, writer):
+        try:
+            request = json.loads((await reader.readline()) or b"{}")
+        except ValueError:
+            request = {}
+        writer.transport.set_write_buffer_limits(high=self.write_buffer)
+        sub = _Subscriber(writer, request.get("topics"), self.max_pending)
+        self.subscribers.add(sub)
+        writer.write(encode("subscribed", 0, {"topics": request.get("topics")}))
+        pump = asyncio.ensure_future(self._pump(sub))
+        try:
+            # subscribers only read; EOF means they went away
+            while await reader.read(1024):
+                pass
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self.subscribers.discard(sub)
+            pump.cancel()
+            writer.close()
+
+    async def _pump(self, sub):
+        try:
+            while True:
+                await sub.wakeup.wait()
+                sub.wakeup.clear()
+                sub.writer.write(sub.take())
+                # while a slow client drains, new events conflate in `sub`
+                await sub.writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+
+
+def _read_events(sock, topics=None):
+    request = {"topics": list(topics)} if topics else {}
+    sock.sendall((json.dumps(request) + "\n").encode())
+    with sock.makefile("rb") as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def iter_events(host="127.0.0.1", port=8765, topics=None, timeout=None):
+    """Subscribe to a StreamServer and yield decoded events as dicts."""
+    with socket.create_connection((host, port), timeout=timeout) as sock:
+        yield from _read_events(sock, topics)
+
+
+class StreamClient:
+    """Background subscriber that keeps the streamed simulation state locally.
+
+    `get_state()` mirrors `SimulationBackend.get_state()` so the dashboard can
+    read from the stream instead of polling the backend. Snapshots are
+    conflated for slow clients, so `history` holds only the snapshots that
+    were received (the latest `max_history`); `missed` counts the ticks whose
+    snapshot never arrived. Wait on `subscribed` before starting the
+    simulation so no early ticks are lost.
+    """
+    def __init__(self, host="127.0.0.1", port=8765, topics=None, max_fills=1000, max_history=1000):
+        self.host = host
+        self.port = int(port)
+        self.topics = topics
+        self.lock = threading.Lock()
+        self.thread = None
+        self.idx = 0
+        self.prices = {}
+        self.history = deque(maxlen=max_history)
+        self.missed = 0
+        self._last_snapshot_tick = -1
+        self.fills = deque(maxlen=max_fills)
+        self.error = None
+        self.subscribed = threading.Event()
+        self._sock = None
+
+    def start(self):
+        if self.thread and self.thread.is_alive():
+            return
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Disconnect and wait for the reader thread to exit."""
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            try:
+                # unblocks the reader thread's readline()
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        if self.thread:
+            self.thread.join(timeout=1.0)
+
+    def _run(self):
+        try:
+            self._sock = socket.create_connection((self.host, self.port))
+            for event in _read_events(self._sock, self.topics):
+                self._apply(event)
+        except (OSError, ValueError) as e:
+            # a deliberate stop() also lands here
+            if self._sock is not None:
+                self.error = e
+
+    def _apply(self, event):
+        data = event["data"]
+        with self.lock:
+            if event["type"] == "subscribed":
+                self.subscribed.set()
+            elif event["type"] == "tick":
+                self.idx = data["tick"] + 1
+                self.prices = data["prices"]
+            elif event["type"] == "fill":
+                self.fills.append(data)
+            elif event["type"] == "snapshot":
+                self.missed += max(0, data["tick"] - self._last_snapshot_tick - 1)
+                self._last_snapshot_tick = data["tick"]
+                self.history.append(data)
+
+    def get_state(self):
+        with self.lock:
+            return {
+                'idx': self.idx,
+                'history': list(self.history),
+                'missed': self.missed,
+                'fills': list(self.fills),
+            }
+
+
+if __name__ == "__main__":
+    # dump events from a running server, e.g. `python -m src.stream 8765 fill`
+    import sys
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    for event in iter_events(port=port, topics=sys.argv[2:]):
+        print(json.dumps(event))
@@ -10,9 +10,11 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')
 
 from src import generator
 from src.engine import SimpleMAStrategy
-from src.portfolio import Portfolio
+from src.portfolio import Portfolio, FixedPointPortfolio
 from src import sim_backend
 from src.orderbook import SimpleOrderBook
+from src.blotter import TradeBlotter, rejection_reason
+from src.stream import StreamClient
 
 st.set_page_config(page_title="Sim-Trader Dashboard", layout="wide")
 st.title("Sim-Trader Dashboard — Live Simulation")
@@ -35,6 +37,9 @@ def init_state():
 		st.session_state.history_df = pd.DataFrame()
 	if 'engines' not in st.session_state:
 		st.session_state.engines = {}
+	if 'blotter' not in st.session_state:
+		st.session_state.blotter = TradeBlotter()
+		st.session_state.fills_df = None
 
 
 init_state()
@@ -69,6 +74,11 @@ with st.sidebar:
 	start_price = st.number_input("Start price", value=100.0)
 	mu = st.number_input("Drift (mu)", value=0.0, format="%f")
 	sigma = st.number_input("Volatility (sigma)", value=0.01, format="%f")
+	# correlated multi-asset model (see generator.generate_universe)
+	correlated = st.checkbox("Correlated market", value=False)
+	rho = st.number_input("Correlation (rho)", min_value=0.0, max_value=0.99, value=0.5, format="%f")
+	use_garch = st.checkbox("Volatility clustering (GARCH)", value=False)
+	use_regimes = st.checkbox("Regime switching", value=False)
 	short_w = st.number_input("Short MA window", min_value=1, max_value=500, value=20)
 	long_w = st.number_input("Long MA window", min_value=2, max_value=2000, value=50)
 	order_size = st.number_input("Order size", min_value=1, max_value=100000, value=10)
@@ -78,24 +88,45 @@ with st.sidebar:
 	position_limit = st.number_input("Position limit", min_value=1, max_value=10000000, value=100000)
 	commission = st.number_input("Commission (abs)", min_value=0.0, max_value=1000.0, value=0.0, format="%f")
 	slippage = st.number_input("Slippage (fraction)", min_value=0.0, max_value=0.1, value=0.0, format="%f")
+	# exact integer accounting on a tick grid
+	fixed_point = st.checkbox("Fixed-point accounting", value=False)
+	tick_size = st.number_input("Tick size", min_value=0.0001, max_value=100.0, value=0.01, format="%f")
+	cash_unit = st.number_input("Cash unit", min_value=0.0001, max_value=100.0, value=0.01, format="%f")
 	# orderbook params
 	ob_depth = st.number_input("Orderbook depth", min_value=1, max_value=1000000, value=1000)
 	ob_spread = st.number_input("Orderbook spread (fraction)", min_value=0.0, max_value=0.1, value=0.001, format="%f")
 	tick_interval = st.number_input("Tick interval (s)", min_value=0.0, max_value=1.0, value=0.01, format="%f")
+	# stream backend events over localhost instead of polling get_state()
+	use_stream = st.checkbox("Stream updates (localhost)", value=False)
+	stream_port = st.number_input("Stream port", min_value=1024, max_value=65535, value=8765)
 	st.write("")
+
+	def make_prices():
+		if correlated:
+			return generator.generate_universe(
+				symbols, n=int(n_ticks), start_price=start_price, mu=mu, sigma=sigma, rho=float(rho),
+				garch=(0.05, 0.9) if use_garch else None,
+				regimes=dict(transition=[[0.995, 0.005], [0.02, 0.98]], vol=[1.0, 3.0]) if use_regimes else None,
+			)
+		return {s: generator.generate_prices(symbol=s, n=n_ticks, start_price=start_price, mu=mu, sigma=sigma) for s in symbols}
+
+	def make_portfolio():
+		if fixed_point:
+			return FixedPointPortfolio(position_limit=int(position_limit), commission=float(commission), slippage=float(slippage), tick_size=float(tick_size), cash_unit=float(cash_unit))
+		return Portfolio(position_limit=int(position_limit), commission=float(commission), slippage=float(slippage))
+
 	if st.button("Generate / Reset"):
 		# generate price series for all symbols
-		prices = {}
-		for s in symbols:
-			prices[s] = generator.generate_prices(symbol=s, n=n_ticks, start_price=start_price, mu=mu, sigma=sigma)
-		st.session_state.prices = prices
+		st.session_state.prices = make_prices()
 		st.session_state.idx = 0
 		# create engines and portfolio with params
 		engines = {s: SimpleMAStrategy(short_window=int(short_w), long_window=int(long_w), order_size=int(order_size)) for s in symbols}
-		portfolio = Portfolio(position_limit=int(position_limit), commission=float(commission), slippage=float(slippage))
+		portfolio = make_portfolio()
 		st.session_state.engines = engines
 		st.session_state.portfolio = portfolio
 		st.session_state.history_df = pd.DataFrame()
+		st.session_state.blotter = TradeBlotter()
+		st.session_state.fills_df = None
 		st.session_state.running = False
 
 	start_local = st.button("Start (single-step loop)")
@@ -110,10 +141,12 @@ with st.sidebar:
 		else:
 			# initialize if needed
 			if 'prices' not in st.session_state or not st.session_state.prices:
-				st.session_state.prices = {s: generator.generate_prices(symbol=s, n=n_ticks, start_price=start_price, mu=mu, sigma=sigma) for s in symbols}
+				st.session_state.prices = make_prices()
 			st.session_state.engine = SimpleMAStrategy(short_window=int(short_w), long_window=int(long_w), order_size=int(order_size))
-			st.session_state.portfolio = Portfolio(position_limit=int(position_limit), commission=float(commission), slippage=float(slippage))
+			st.session_state.portfolio = make_portfolio()
 			st.session_state.history_df = pd.DataFrame()
+			st.session_state.blotter = TradeBlotter()
+			st.session_state.fills_df = None
 			st.session_state.idx = 0
 			st.session_state.running = True
 			st.session_state.auto = True
@@ -127,19 +160,31 @@ with st.sidebar:
 			st.warning("Please specify symbols to run background simulation")
 		else:
 			# prepare engines and prices
-			prices = {s: generator.generate_prices(symbol=s, n=n_ticks, start_price=start_price, mu=mu, sigma=sigma) for s in symbols}
+			prices = make_prices()
 			engines = {s: SimpleMAStrategy(short_window=int(short_w), long_window=int(long_w), order_size=int(order_size)) for s in symbols}
-			portfolio = Portfolio(position_limit=int(position_limit), commission=float(commission), slippage=float(slippage))
+			portfolio = make_portfolio()
 			# configure simple orderbook
-			ob = SimpleOrderBook(depth=int(ob_depth), spread=float(ob_spread))
+			ob = SimpleOrderBook(depth=int(ob_depth), spread=float(ob_spread), tick_size=float(tick_size) if fixed_point else None)
 			# attach custom orderbook to backend
 			sim_backend._backend.orderbook = ob
 			sim_backend.configure(prices=prices, engines=engines, portfolio=portfolio, tick_interval=float(tick_interval))
+			if st.session_state.get('stream_client') is not None:
+				st.session_state.stream_client.stop()
+			st.session_state.stream_client = None
+			if use_stream:
+				server = sim_backend.start_stream(port=int(stream_port))
+				client = StreamClient(port=server.port)
+				client.start()
+				# publish() skips clients that are not registered yet
+				client.subscribed.wait(timeout=2.0)
+				st.session_state.stream_client = client
 			sim_backend.start()
 			st.session_state.running_bg = True
 
 	if stop_bg:
 		sim_backend.stop()
+		if st.session_state.get('stream_client') is not None:
+			st.session_state.stream_client.stop()
 		st.session_state.running_bg = False
 
 	if persist_btn:
@@ -159,6 +204,7 @@ with cols[0]:
 	st.subheader("Price / Orders")
 	price_plot_placeholder = st.empty()
 	trades_placeholder = st.empty()
+	fills_placeholder = st.empty()
 
 with cols[1]:
 	st.subheader("Portfolio Metrics")
@@ -191,19 +237,26 @@ def step_simulation():
 
 	# strategy decision (single-symbol engine for local stepping)
 	decision = engine.on_price(price) if engine is not None else None
+	blotter = st.session_state.blotter
 	trade_info = None
 	if decision == 'BUY':
 		try:
-			portfolio.execute_trade(symbol, int(order_size), price)
-			trade_info = f"BUY {int(order_size)} @ {price:.2f}"
+			fill = portfolio.execute_trade(symbol, int(order_size), price)
 		except Exception as e:
+			blotter.record_rejection(idx, timestamp, symbol, int(order_size), price, rejection_reason(e))
 			trade_info = f"BUY failed: {e}"
+		else:
+			blotter.record_fill(idx, timestamp, fill, mid_price=price)
+			trade_info = f"BUY {int(order_size)} @ {price:.2f}"
 	elif decision == 'SELL':
 		try:
-			portfolio.execute_trade(symbol, -int(order_size), price)
-			trade_info = f"SELL {int(order_size)} @ {price:.2f}"
+			fill = portfolio.execute_trade(symbol, -int(order_size), price)
 		except Exception as e:
+			blotter.record_rejection(idx, timestamp, symbol, -int(order_size), price, rejection_reason(e))
 			trade_info = f"SELL failed: {e}"
+		else:
+			blotter.record_fill(idx, timestamp, fill, mid_price=price)
+			trade_info = f"SELL {int(order_size)} @ {price:.2f}"
 
 	# mark to market and record
 	snapshot = portfolio.mark_to_market({symbol: price}, timestamp=timestamp)
@@ -226,6 +279,12 @@ def render_ui():
 	prices = st.session_state.prices
 	hdf = st.session_state.history_df
 	idx = st.session_state.idx
+	if st.session_state.get('fills_df') is not None:
+		# streamed fills (see src.stream)
+		fdf = st.session_state.fills_df
+		fills = fdf[fdf['symbol'] == symbol] if not fdf.empty else fdf
+	else:
+		fills = st.session_state.blotter.range(symbol=symbol)
 
 	# if prices is a dict, show the selected symbol series
 	if prices is not None:
@@ -244,6 +303,15 @@ def render_ui():
 				recent = prices_df
 			fig, ax = plt.subplots(figsize=(10, 5))
 			ax.plot(recent['timestamp'], recent['price'], label='price', linewidth=1.5)
+			# trade markers at the executed price
+			if not fills.empty:
+				done = fills[fills['reason'].isna()]
+				buys = done[done['side'] == 'BUY']
+				sells = done[done['side'] == 'SELL']
+				if not buys.empty:
+					ax.scatter(buys['timestamp'], buys['price'], marker='^', color='green', label='buy', zorder=3)
+				if not sells.empty:
+					ax.scatter(sells['timestamp'], sells['price'], marker='v', color='red', label='sell', zorder=3)
 			ax.set_title(f"{symbol} price (ticks: {idx}/{len(prices_df)})")
 			ax.set_xlabel('Time')
 			ax.set_ylabel('Price')
@@ -263,11 +331,27 @@ def render_ui():
 		trades_placeholder.write("No trades yet. Click 'Start' to begin simulation.")
 		metrics_placeholder.write({"status": "Waiting for simulation to start..."})
 
+	# fills table from the trade blotter
+	if not fills.empty:
+		fills_placeholder.dataframe(fills.tail(20))
+
 
 # Main loop: advance one step when running
 if st.session_state.get('running_bg'):
 	# when background runner is active, poll its state and render
-	state = sim_backend.get_state()
+	client = st.session_state.get('stream_client')
+	if client is not None:
+		state = client.get_state()
+		st.session_state.fills_df = pd.DataFrame(state['fills'])
+		if not st.session_state.fills_df.empty:
+			st.session_state.fills_df['timestamp'] = pd.to_datetime(st.session_state.fills_df['timestamp'])
+		if state['missed']:
+			# slow clients get conflated snapshots, so the history is a sample
+			st.caption(f"Streaming: {state['missed']} snapshots skipped for this client; P&L history is sampled.")
+	else:
+		state = sim_backend.get_state()
+		st.session_state.fills_df = None
+		st.session_state.blotter = state.get('blotter')
 	h = state.get('history', [])
 	if h:
 		st.session_state.history_df = pd.DataFrame(h)
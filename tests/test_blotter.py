@@ -0,0 +1,114 @@
+import pytest
+import pandas as pd
+from src.blotter import TradeBlotter, rejection_reason, REJECT_POSITION_LIMIT, REJECT_INSUFFICIENT_POSITION, REJECT_OTHER
+from src.portfolio import Portfolio, PositionLimitError
+
+def _blotter():
+    b = TradeBlotter(capacity=2)
+    times = pd.date_range("2025-01-01", periods=10, freq="min")
+    for tick in range(10):
+        sym = 'A' if tick % 2 == 0 else 'B'
+        b.record(tick, times[tick], sym, 10 if tick < 6 else -5, 100.0 + tick, commission=1.0)
+    return b
+
+def test_record_grows_and_frames():
+    b = _blotter()
+    assert len(b) == 10
+    df = b.to_frame()
+    assert list(df['tick']) == list(range(10))
+    assert list(df['symbol'][:2]) == ['A', 'B']
+    assert df['side'].iloc[0] == 'BUY' and df['side'].iloc[-1] == 'SELL'
+    assert df['reason'].isna().all()
+
+def test_range_queries():
+    b = _blotter()
+    assert list(b.range(2, 5)['tick']) == [2, 3, 4]
+    assert list(b.range(2, 7, symbol='A')['tick']) == [2, 4, 6]
+    assert b.range(symbol='missing').empty
+    df = b.between("2025-01-01 00:03", "2025-01-01 00:06", symbol='B')
+    assert list(df['tick']) == [3, 5]
+
+def test_out_of_order_rejected():
+    b = _blotter()
+    with pytest.raises(ValueError):
+        b.record(3, None, 'A', 1, 1.0)
+
+def test_by_symbol():
+    b = _blotter()
+    b.record_rejection(10, "2025-01-01 00:10", 'A', 10, 110.0, REJECT_POSITION_LIMIT)
+    agg = b.by_symbol()
+    assert agg.loc['A', 'fills'] == 5
+    assert agg.loc['A', 'rejections'] == 1
+    assert agg.loc['A', 'buy_volume'] == 30
+    assert agg.loc['A', 'net_size'] == 30 - 10
+    assert agg.loc['B', 'commission'] == 5.0
+
+def test_by_bucket():
+    b = _blotter()
+    ticks = b.by_bucket(5)
+    assert list(ticks.index) == [0, 5]
+    assert list(ticks['fills']) == [5, 5]
+    times = b.by_bucket("5min", symbol='A')
+    assert list(times['fills']) == [3, 2]
+
+def test_record_fill_from_portfolio():
+    p = Portfolio(cash=1000, slippage=0.01, position_limit=10)
+    b = TradeBlotter()
+    fill = p.execute_trade('A', 10, 10.0)
+    b.record_fill(0, None, fill, mid_price=10.0)
+    assert b.to_frame()['slippage_cost'].iloc[0] == pytest.approx(1.0)
+    with pytest.raises(PositionLimitError):
+        p.execute_trade('A', 1, 10.0)
+
+def test_rejection_reason_mapping():
+    p = Portfolio(cash=1000, position_limit=10)
+    p.execute_trade('A', 5, 10.0)
+    with pytest.raises(ValueError) as limit:
+        p.execute_trade('A', 6, 10.0)
+    with pytest.raises(ValueError) as short:
+        p.execute_trade('B', -1, 10.0)
+    assert rejection_reason(limit.value) == REJECT_POSITION_LIMIT
+    assert rejection_reason(short.value) == REJECT_INSUFFICIENT_POSITION
+    assert rejection_reason(RuntimeError()) == REJECT_OTHER
+
+def test_missing_timestamps_stay_out_of_time_index():
+    b = TradeBlotter()
+    b.record(0, "2025-01-01 00:00", 'A', 1, 10.0)
+    b.record(1, None, 'A', 1, 10.0)
+    b.record(2, "2025-01-01 00:02", 'A', 1, 10.0)
+    assert len(b) == 3
+    assert list(b.between("2025-01-01", "2025-01-02")['tick']) == [0, 2]
+    assert list(b.between("2025-01-01", "2025-01-02", symbol='A')['tick']) == [0, 2]
+    assert b.to_frame()['timestamp'].isna().tolist() == [False, True, False]
+
+def test_timezone_is_kept():
+    b = TradeBlotter()
+    times = pd.date_range("2025-01-01 09:00", periods=3, freq="h", tz="America/New_York")
+    for tick, ts in enumerate(times):
+        b.record(tick, ts, 'A', 1, 10.0)
+    df = b.between(pd.Timestamp("2025-01-01 10:00", tz="America/New_York"))
+    assert list(df['tick']) == [1, 2]
+    assert str(df['timestamp'].dt.tz) == "America/New_York"
+    with pytest.raises(ValueError):
+        b.between("2025-01-01 10:00")  # naive query against tz-aware rows
+    assert b.by_bucket("1h").index.tz is not None
+
+def test_by_bucket_rejects_float():
+    b = _blotter()
+    with pytest.raises(ValueError):
+        b.by_bucket(2.0)
+
+def test_blotter_errors_do_not_stop_backend():
+    from src.sim_backend import SimulationBackend
+    from src.generator import generate_prices
+    from src.engine import SimpleMAStrategy
+
+    def broken(*args, **kwargs):
+        raise ValueError("broken blotter")
+    backend = SimulationBackend()
+    backend.configure({'A': generate_prices(symbol='A', n=100)}, {'A': SimpleMAStrategy(5, 20, 10)},
+                      Portfolio(), tick_interval=0)
+    backend.blotter.record_fill = broken
+    backend.start()
+    backend.thread.join(timeout=5)
+    assert backend.idx == 100
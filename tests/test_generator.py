@@ -1,6 +1,7 @@
 import pytest
+import numpy as np
 import pandas as pd
-from src.generator import generate_prices
+from src.generator import generate_prices, generate_universe
 
 def test_generate_prices_length():
     df = generate_prices(n=100)
@@ -18,3 +19,64 @@ def test_generate_prices_reproducible():
     df1 = generate_prices(n=100, seed=42)
     df2 = generate_prices(n=100, seed=42)
     pd.testing.assert_frame_equal(df1, df2)
+
+def test_generate_universe_shape():
+    prices = generate_universe(['A', 'B'], n=100)
+    assert list(prices) == ['A', 'B']
+    assert list(prices['A'].columns) == ['timestamp', 'symbol', 'price']
+    assert len(prices['B']) == 100
+    assert prices['A']['price'].iloc[0] == pytest.approx(100.0)
+
+def test_generate_universe_correlated():
+    prices = generate_universe(4, n=20000, rho=0.8, chunk_size=3000)
+    rets = np.diff(np.log(np.column_stack([df['price'] for df in prices.values()])), axis=0)
+    corr = np.corrcoef(rets.T)
+    assert np.all(corr[np.triu_indices(4, 1)] > 0.7)
+
+def test_generate_universe_reproducible_and_chunked_out():
+    kwargs = dict(n=500, seed=7, garch=(0.1, 0.8), regimes=dict(transition=[[0.9, 0.1], [0.2, 0.8]], vol=[1, 2]), chunk_size=64)
+    a = generate_universe(3, **kwargs)
+    out = np.empty((500, 3))
+    times, b = generate_universe(3, out=out, **kwargs)
+    assert b is out
+    assert len(times) == 500
+    np.testing.assert_array_equal(a['SYM1']['price'].to_numpy(), out[:, 1])
+    assert np.all(out > 0)
+
+def test_generate_universe_invalid_params():
+    with pytest.raises(ValueError):
+        generate_universe(2, n=10, garch=(0.5, 0.6))
+    with pytest.raises(ValueError):
+        generate_universe(2, n=10, loadings=[[0.9, 0.9], [0.1, 0.1]])
+    with pytest.raises(ValueError):
+        generate_universe(2, n=10, corr=[[1.0, 2.0], [2.0, 1.0]])
+    for regimes in (dict(transition=[[0.9]]),
+                    dict(transition=[[0.9, 0.1]]),
+                    dict(transition=[[1.2, -0.2], [0.5, 0.5]]),
+                    dict(transition=[[0.9, 0.1], [0.1, 0.9]], vol=[1.0, 2.0, 3.0])):
+        with pytest.raises(ValueError):
+            generate_universe(2, n=10, regimes=regimes)
+
+def test_generate_universe_one_dimensional_loadings():
+    prices = generate_universe(3, n=5000, sigma=0.01, loadings=[0.9, 0.9, 0.0], jump_prob=0.0)
+    rets = np.diff(np.log(np.column_stack([prices[s]['price'] for s in prices])), axis=0)
+    c = np.corrcoef(rets.T)
+    assert c[0, 1] == pytest.approx(0.81, abs=0.05)
+    assert abs(c[0, 2]) < 0.05
+
+def test_generate_universe_regime_scales_shock_not_drift():
+    # regime pinned to vol=3; drift must stay mu + m, not 3 * mu
+    regimes = dict(transition=[[1.0]], mu=[0.002], vol=[3.0])
+    prices = generate_universe(2, n=2000, mu=0.01, sigma=1e-9, regimes=regimes, jump_prob=0.0)
+    rets = np.diff(np.log(prices['SYM0']['price'].to_numpy()))
+    assert rets.mean() == pytest.approx(0.012, abs=1e-6)
+
+def test_generate_universe_independent_of_chunk_size():
+    kwargs = dict(n=300, seed=7, rho=0.3, garch=(0.1, 0.8), jump_prob=0.05,
+                  regimes=dict(transition=[[0.9, 0.1], [0.2, 0.8]], vol=[1, 2]))
+    a = generate_universe(3, chunk_size=64, **kwargs)
+    b = generate_universe(3, chunk_size=128, **kwargs)
+    c = generate_universe(3, **kwargs)
+    for s in a:
+        np.testing.assert_allclose(a[s]['price'], b[s]['price'], rtol=1e-12)
+        np.testing.assert_allclose(a[s]['price'], c[s]['price'], rtol=1e-12)
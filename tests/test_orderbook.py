@@ -0,0 +1,23 @@
+import pytest
+from src.orderbook import SimpleOrderBook
+
+def test_market_order_impact():
+    ob = SimpleOrderBook(depth=1000, spread=0.01)
+    price, size = ob.execute_market_order('A', 100, 100.0)
+    assert price == pytest.approx(100.1)
+    assert size == 100
+    price, _ = ob.execute_market_order('A', -100, 100.0)
+    assert price == pytest.approx(99.9)
+
+def test_market_order_tick_grid():
+    ob = SimpleOrderBook(depth=1000, spread=0.01, tick_size=0.05)
+    buy, _ = ob.execute_market_order('A', 1, 100.01)
+    sell, _ = ob.execute_market_order('A', -1, 100.01)
+    # tiny impact still costs a whole tick against the initiator
+    assert round(buy / 0.05) == 2001
+    assert round(sell / 0.05) == 1999
+
+def test_market_order_tick_prices_are_on_grid():
+    ob = SimpleOrderBook(depth=1000, spread=0.0, tick_size=0.05)
+    price, _ = ob.execute_market_order('A', 1, 0.35)
+    assert price == 0.35
@@ -1,5 +1,5 @@
 import pytest
-from src.portfolio import Portfolio
+from src.portfolio import Portfolio, FixedPointPortfolio, PositionLimitError, InsufficientPositionError
 
 def test_buy_sell():
     p = Portfolio(cash=1000)
@@ -34,3 +34,128 @@ def test_mark_to_market():
     snapshot = p.mark_to_market({'A': 12})
     assert snapshot['unrealized_pnl'] == 20
     assert snapshot['total_exposure'] == 120
+
+def test_fixed_point_buy_sell():
+    p = FixedPointPortfolio(cash=1000, tick_size=0.01)
+    p.execute_trade('A', size=5, price=10)
+    p.execute_trade('A', size=5, price=12)
+    assert p.positions['A'] == {'size': 10, 'avg_price': 11.0}
+    p.execute_trade('A', size=-10, price=12)
+    assert p.realized_pnl_minor == 1000  # 10.00 in cents
+    assert p.cash == 1010.0
+    assert p.positions == {}
+
+def test_fixed_point_no_drift():
+    p = FixedPointPortfolio(cash=0, tick_size=0.01, position_limit=10**9)
+    for _ in range(10000):
+        p.execute_trade('A', 1, 0.1)
+    assert p.cash_minor == -100000
+    assert p.cash == -1000.0
+
+def test_fixed_point_partial_sells_realize_exactly():
+    p = FixedPointPortfolio(cash=0, tick_size=0.01)
+    for price in (10.01, 10.02, 10.04):
+        p.execute_trade('A', 1, price)
+    for _ in range(3):
+        p.execute_trade('A', -1, 11.00)
+    # proceeds 33.00 - costs 30.07, regardless of how cost was split
+    assert p.realized_pnl_minor == 293
+    assert p.cash_minor == 293
+
+def test_fixed_point_rejects_without_side_effects():
+    p = FixedPointPortfolio(cash=1000, position_limit=10)
+    p.execute_trade('A', size=5, price=10)
+    with pytest.raises(InsufficientPositionError):
+        p.execute_trade('A', size=-10, price=12)
+    with pytest.raises(PositionLimitError):
+        p.execute_trade('A', size=6, price=12)
+    assert p.cash == 950.0
+
+def test_fixed_point_mark_to_market():
+    p = FixedPointPortfolio(cash=1000, tick_size=0.05, cash_unit=0.01)
+    p.execute_trade('A', size=10, price=10.02)  # snaps to 10.00
+    p.execute_trade('B', size=1, price=5)
+    snapshot = p.mark_to_market({'A': 12})
+    assert snapshot['unrealized_pnl'] == 20
+    assert snapshot['total_exposure'] == 120
+    assert snapshot['cash'] == 1000 - 100 - 5
+    assert p.snapshot_positions(snapshot) == {'A': {'size': 10, 'avg_price': 10.0}, 'B': {'size': 1, 'avg_price': 5.0}}
+
+def test_fixed_point_large_book_matches_small_path():
+    small = FixedPointPortfolio(cash=10**6, position_limit=10**6)
+    small.SMALL_BOOK = 10**6  # force the int loop
+    large = FixedPointPortfolio(cash=10**6, position_limit=10**6)
+    large.SMALL_BOOK = 0  # force the vectorized path
+    prices = {f"S{i}": 10 + i * 0.01 for i in range(100)}
+    for p in (small, large):
+        for i, s in enumerate(prices):
+            p.execute_trade(s, i + 1, 10.0)
+    marks = dict(list(prices.items())[::2])  # some symbols unpriced
+    a, b = small.mark_to_market(marks), large.mark_to_market(marks)
+    assert a['unrealized_pnl'] == b['unrealized_pnl']
+    assert a['total_exposure'] == b['total_exposure']
+
+def test_fixed_point_snapshots_are_compact():
+    symbols = [f"S{i}" for i in range(500)]
+    p = FixedPointPortfolio(cash=10**9, position_limit=10**6)
+    for s in symbols:
+        p.execute_trade(s, 10, 100.0)
+    snapshot = p.mark_to_market({s: 101.0 for s in symbols})
+    # two int64 arrays per snapshot instead of a dict per symbol
+    assert 'positions' not in snapshot
+    assert snapshot['sizes'].nbytes + snapshot['costs'].nbytes == 2 * 8 * 500
+    # the symbol tuple is shared until a new symbol is added
+    assert snapshot['symbols'] is p.mark_to_market({})['symbols']
+    assert p.snapshot_positions(snapshot)['S499'] == {'size': 10, 'avg_price': 100.0}
+
+def test_fixed_point_rejected_order_does_not_register_symbol():
+    p = FixedPointPortfolio(cash=1000, position_limit=10)
+    with pytest.raises(InsufficientPositionError):
+        p.execute_trade('B', size=-1, price=10)
+    with pytest.raises(PositionLimitError):
+        p.execute_trade('C', size=11, price=10)
+    assert p.symbols == []
+
+def test_fixed_point_mutators_update_arrays():
+    p = FixedPointPortfolio(cash=1000)
+    p._buy('A', 4, 1000)
+    p._sell('A', 1, 1100)
+    assert p.positions == {'A': {'size': 3, 'avg_price': 10.0}}
+    assert p.realized_pnl_minor == 100
+    with pytest.raises(InsufficientPositionError):
+        p._sell('A', 5, 1100)
+
+def test_fixed_point_persist_history(tmp_path):
+    p = FixedPointPortfolio(cash=1000)
+    p.execute_trade('A', size=2, price=10)
+    p.mark_to_market({'A': 11})
+    path = tmp_path / "hist.csv"
+    p.persist_history(str(path))
+    text = path.read_text()
+    assert text.splitlines()[0] == "timestamp,cash,realized_pnl,unrealized_pnl,total_exposure,positions"
+    assert "'avg_price': 10.0" in text
+
+def test_fixed_point_invalid_units():
+    with pytest.raises(ValueError):
+        FixedPointPortfolio(tick_size=0.01, cash_unit=0.03)
+    with pytest.raises(ValueError):
+        FixedPointPortfolio(tick_size=0.001)  # finer than the default cash unit
+    with pytest.raises(ValueError):
+        FixedPointPortfolio(cash=1000.005)
+    with pytest.raises(ValueError):
+        FixedPointPortfolio(commission=0.001)
+
+def test_fixed_point_cash_unit_independent_of_tick():
+    p = FixedPointPortfolio(cash=1000, tick_size=0.05, commission=0.01)
+    assert p.commission == 0.01
+    p.execute_trade('A', size=1, price=0.35)
+    assert p.cash == 1000 - 0.35 - 0.01
+
+def test_fixed_point_prices_are_on_grid():
+    p = FixedPointPortfolio(cash=1000, tick_size=0.05, position_limit=10**6)
+    fill = p.execute_trade('A', size=1, price=0.35)
+    assert fill['price'] == 0.35  # not 7 * 0.05 == 0.35000000000000003
+    p.execute_trade('A', size=2, price=0.35)
+    assert p.positions['A']['avg_price'] == 0.35
+    odd = FixedPointPortfolio(cash=1000, tick_size=0.03)
+    assert odd.execute_trade('A', size=1, price=0.09)['price'] == 0.09
@@ -0,0 +1,105 @@
+import json
+import socket
+import time
+import pytest
+from src.stream import StreamServer, StreamClient, _Subscriber, encode
+from src.sim_backend import SimulationBackend
+from src.generator import generate_prices
+from src.engine import SimpleMAStrategy
+from src.portfolio import Portfolio
+
+def test_subscriber_conflates_and_drops():
+    sub = _Subscriber(writer=None, topics=None, max_pending=2)
+    for i in range(5):
+        sub.offer('tick', encode('tick', i, {'tick': i}))
+        sub.offer('fill', encode('fill', i, {'tick': i}))
+    lines = [json.loads(l) for l in sub.take().splitlines()]
+    assert [e['type'] for e in lines] == ['fill', 'fill', 'tick']
+    assert [e['seq'] for e in lines] == [3, 4, 4]
+    assert sub.dropped == 4 + 3
+
+def test_subscriber_topic_filter():
+    sub = _Subscriber(writer=None, topics=['fill'], max_pending=10)
+    sub.offer('tick', encode('tick', 1, {}))
+    assert sub.take() == b""
+
+def test_backend_streams_to_subscriber():
+    server = StreamServer(port=0)
+    server.start()
+    try:
+        backend = SimulationBackend()
+        backend.add_listener(server.publish)
+        client = StreamClient(port=server.port)
+        client.start()
+        ticks_only = StreamClient(port=server.port, topics=['tick'])
+        ticks_only.start()
+        assert client.subscribed.wait(timeout=5)
+        assert ticks_only.subscribed.wait(timeout=5)
+        backend.configure({'A': generate_prices(symbol='A', n=200)},
+                          {'A': SimpleMAStrategy(5, 20, 10)}, Portfolio(), tick_interval=0)
+        backend.start()
+        backend.thread.join(timeout=5)
+        deadline = time.time() + 5
+        # the snapshot line follows the tick line, so wait for it
+        while not client.get_state()['history'] or client.get_state()['history'][-1]['tick'] < 199:
+            if time.time() > deadline:
+                break
+            time.sleep(0.01)
+        state = client.get_state()
+        assert state['idx'] == 200
+        assert state['history'][-1]['tick'] == 199
+        assert len(state['fills']) > 0
+        assert 'A' in client.prices
+        assert ticks_only.get_state()['fills'] == []
+    finally:
+        server.stop()
+
+def test_client_stop_disconnects_and_tracks_missed():
+    server = StreamServer(port=0)
+    server.start()
+    try:
+        client = StreamClient(port=server.port, max_history=2)
+        client.start()
+        assert client.subscribed.wait(timeout=5)
+        deadline = time.time() + 5
+        assert len(server.subscribers) == 1
+        # ticks before the first received snapshot count as missed too
+        client._apply({'type': 'snapshot', 'data': {'tick': 2}})
+        client._apply({'type': 'snapshot', 'data': {'tick': 4}})
+        client._apply({'type': 'snapshot', 'data': {'tick': 5}})
+        state = client.get_state()
+        assert state['missed'] == 3
+        assert [s['tick'] for s in state['history']] == [4, 5]
+        client.stop()
+        assert not client.thread.is_alive()
+        while server.subscribers and time.time() < deadline:
+            time.sleep(0.01)
+        assert not server.subscribers
+        assert client.error is None
+    finally:
+        server.stop()
+
+def test_start_stream_on_busy_port_leaves_no_server():
+    import src.sim_backend as sim_backend
+    with socket.socket() as busy:
+        busy.bind(('127.0.0.1', 0))
+        busy.listen()
+        with pytest.raises(OSError):
+            sim_backend.start_stream(port=busy.getsockname()[1])
+    assert sim_backend._stream is None
+    assert sim_backend._backend.listeners == []
+
+def test_fixed_point_snapshots_carry_positions():
+    from src.portfolio import FixedPointPortfolio
+    backend = SimulationBackend()
+    snapshots = []
+    backend.add_listener(lambda topic, data: topic == 'snapshot' and snapshots.append(data))
+    backend.configure({'A': generate_prices(symbol='A', n=100)},
+                      {'A': SimpleMAStrategy(5, 20, 10)}, FixedPointPortfolio(), tick_interval=0)
+    backend.start()
+    backend.thread.join(timeout=5)
+    held = [s for s in snapshots if s['sizes'].any()]
+    assert held and all(s['positions'] for s in held)
+    assert json.loads(encode('snapshot', 1, held[-1]))['data']['positions']['A']['size'] == held[-1]['sizes'][0]
+    # the backend's own history keeps the compact form
+    assert 'positions' not in backend.history[-1]